@@ -1,20 +1,59 @@
 import os
+import atexit
 import json
+import logging
+import logging.handlers
+import queue
+import mmap
 import re
 import random
+import stat
+import tempfile
+import threading
+import time
 import aiohttp
 import discord
 import asyncio
 import yt_dlp
 
+from concurrent.futures import ThreadPoolExecutor
+from enum import IntEnum
 from typing import Callable, Dict, Any, List, Optional, Type
 from discord.ext import commands
 
+# orjson is optional: it's much faster at (de)serializing the state file and
+# API responses, but we fall back to the stdlib json module if it isn't installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def json_loads(data: bytes | str) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
 
 # ============================================================
 # GLOBALS, CONSTANTS and ENVIRONMENT VARIABLES
 # ============================================================
 
+# Log records go through a queue and are written to the stream by a listener
+# thread, so logging never blocks the event loop on a slow stdout.
+_log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+_log_stream = logging.StreamHandler()
+_log_stream.setFormatter(logging.Formatter(
+    "[{asctime}] [{levelname:<8}] {name}: {message}", "%Y-%m-%d %H:%M:%S", style="{"
+))
+_log_listener = logging.handlers.QueueListener(_log_queue, _log_stream)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+logging.getLogger().setLevel(logging.INFO)
+log = logging.getLogger("brokenmic")
+
 def env[T = str](var: str, default: T | None = None, conv: Callable[[str], T] = str) -> T:
     str_val = os.getenv(var)
 
@@ -27,7 +66,7 @@ def env[T = str](var: str, default: T | None = None, conv: Callable[[str], T] =
         else:
             val = conv(str_val)
 
-        print(f"{var}: {val}")
+        log.info("%s: %s", var, val)
         return val
     except TypeError as e:
         raise TypeError(f"env var '{var}' = '{str_val}' has the wrong type") from e
@@ -38,7 +77,15 @@ COMMAND_PREFIX = env("BM_COMMAND_PREFIX", ";")
 DEBUG = env("BM_DEBUG", False, lambda x: x != "no")
 AUDIO_DIR = env("BM_AUDIO_DIR", "bm_audio")
 STATE_FILE = env("BM_STATE_FILE", "bm_state.json")
+# Seconds to wait after a state change before writing, so bursts of changes
+# are coalesced into a single write.
+STATE_FLUSH_DELAY = env("BM_STATE_FLUSH_DELAY", 0.2, float)
 MAX_AUDIO_MB = env("BM_MAX_AUDIO_MB", 128, int)
+MAX_CONCURRENT_DOWNLOADS = env("BM_MAX_CONCURRENT_DOWNLOADS", 4, int)
+
+# How many DMs we send to players at once. discord.py handles 429s itself,
+# this just keeps a big league from flooding the REST queue.
+MAX_CONCURRENT_DMS = 8
 
 
 os.makedirs(AUDIO_DIR, exist_ok=True)
@@ -53,104 +100,417 @@ bot = commands.Bot(command_prefix=COMMAND_PREFIX, intents=intents)
 # STATE MANAGEMENT
 # ============================================================
 
+# State files at least this big are memory-mapped and parsed in place rather
+# than read into an intermediate buffer first.
+STATE_MMAP_THRESHOLD = 1024 * 1024
+
+# After a failed state write, wait a second before retrying, doubling the wait
+# after each further failure up to this many seconds.
+STATE_RETRY_MAX_DELAY = 60.0
+
 def load_state():
-    if not os.path.exists(STATE_FILE):
+    try:
+        with open(STATE_FILE, "rb") as f:
+            # Only orjson can parse straight from the mapped buffer; stdlib json would copy it anyway
+            if orjson is not None and os.fstat(f.fileno()).st_size >= STATE_MMAP_THRESHOLD:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    with memoryview(mm) as buf:
+                        return orjson.loads(buf)
+
+            return json_loads(f.read())
+    except FileNotFoundError:
         return {}
-    with open(STATE_FILE, "r", encoding="utf-8") as f:
+    except json.JSONDecodeError:
+        return {}
+
+# The process umask, read once up front: os.umask() can only be queried by
+# setting it, which isn't safe once writer threads are running.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def state_file_mode() -> int:
+    """
+    Permissions for a new state file: those of the existing one, or the
+    umask-based default a plain open() would have used.
+    """
+    try:
+        return stat.S_IMODE(os.stat(STATE_FILE).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
+
+def write_state_atomic(payload: bytes):
+    """
+    Writes the serialized state to a temp file, then renames it over STATE_FILE
+    so a crash mid-write never leaves a truncated state file behind.
+    """
+    # A unique temp name per write, so the shutdown flush can't collide with
+    # a background write that's still in flight.
+    fd, tmp = tempfile.mkstemp(
+        prefix=os.path.basename(STATE_FILE) + ".",
+        suffix=".tmp",
+        dir=os.path.dirname(STATE_FILE) or ".",
+    )
+    try:
+        # mkstemp always creates the file as 0600; keep the usual permissions
+        os.fchmod(fd, state_file_mode())
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+        os.replace(tmp, STATE_FILE)
+    except BaseException:
         try:
-            return json.load(f)
-        except json.JSONDecodeError:
-            return {}
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+def serialize_state() -> bytes:
+    # Pretty-print only when debugging; the compact form is much smaller and faster.
+    if orjson is not None:
+        return orjson.dumps(state, option=orjson.OPT_INDENT_2 if DEBUG else 0)
+
+    if DEBUG:
+        payload = json.dumps(state, ensure_ascii=False, indent=2)
+    else:
+        payload = json.dumps(state, ensure_ascii=False, separators=(",", ":"))
+    return payload.encode("utf-8")
+
+def flush_state():
+    write_state_atomic(serialize_state())
+
+
+_state_dirty = asyncio.Event()
+
+# The background write currently on disk-I/O, if any. Cancelling the flusher
+# doesn't stop a write that's already running in a thread, so shutdown waits
+# on this before doing its own final write.
+_state_write: Optional[asyncio.Future[None]] = None
 
 def save_state():
-    with open(STATE_FILE, "w", encoding="utf-8") as f:
-        json.dump(state, f, indent=2)
+    """
+    Marks the state as changed. The write itself is batched by state_flusher().
+    """
+    _state_dirty.set()
+
+async def state_flusher():
+    global _state_write
+    failures = 0
+    while True:
+        await _state_dirty.wait()
+        await asyncio.sleep(STATE_FLUSH_DELAY)
+        _state_dirty.clear()
+        try:
+            # Serialize on the event loop so the state can't change mid-dump,
+            # then do the disk I/O off the loop.
+            payload = serialize_state()
+            _state_write = asyncio.ensure_future(asyncio.to_thread(write_state_atomic, payload))
+            await asyncio.shield(_state_write)
+        except Exception as e:
+            # Keep the flusher alive, but back off while the failure persists
+            failures += 1
+            retry_in = min(2.0 ** (failures - 1), STATE_RETRY_MAX_DELAY)
+            if failures == 1:
+                log.exception("Failed to save state to %s; retrying in %.1fs", STATE_FILE, retry_in)
+            else:
+                log.warning("Still failing to save state to %s (%s); retrying in %.1fs", STATE_FILE, e, retry_in)
+            _state_dirty.set()
+            await asyncio.sleep(retry_in)
+        else:
+            if failures:
+                log.info("Saved state to %s after %d failed attempts", STATE_FILE, failures)
+            failures = 0
+
+def number_submissions(subs: Dict[str, Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """
+    Lays submissions (keyed by player ID) out as parallel columns, one list
+    per field (index = entry_id - 1), for storing as numbered_submissions.
+    """
+    return {
+        "player_id": [int(pid) for pid in subs],
+        "url": [s["url"] for s in subs.values()],
+        "video_id": [s["video_id"] for s in subs.values()],
+        "title": [s["title"] for s in subs.values()],
+        "description": [s.get("description", "") for s in subs.values()],
+    }
+
+def upgrade_round(r: Dict[str, Any]):
+    # Older state files stored submissions and votes as lists of dicts
+    if isinstance(r.get("submissions"), list):
+        r["submissions"] = {str(s.pop("player_id")): s for s in r["submissions"]}
+    votes = r.get("votes")
+    if isinstance(votes, list):
+        r["votes"] = {str(v["voter_id"]): v["distribution"] for v in votes}
+    elif votes and "distribution" in next(iter(votes.values())):
+        # ...or wrapped each distribution in a {"distribution": ...} dict
+        r["votes"] = {uid: v["distribution"] for uid, v in votes.items()}
+
+    # ...and numbered_submissions as a list of dicts
+    if isinstance(r.get("numbered_submissions"), list):
+        subs = r["numbered_submissions"]
+        r["numbered_submissions"] = number_submissions({str(s["player_id"]): s for s in subs})
+
+    if "numbered_submissions" in r:
+        # ...kept the submissions list alongside it...
+        r.pop("submissions", None)
+
+        # ...and stored vote distributions as {entry_id: points} dicts
+        n = len(r["numbered_submissions"]["player_id"])
+        for uid, dist in r.get("votes", {}).items():
+            if isinstance(dist, dict):
+                points = [0] * n
+                for sid, pts in dist.items():
+                    idx = int(sid) - 1
+                    if 0 <= idx < n:
+                        points[idx] = pts
+                r["votes"][uid] = points
+
+def upgrade_guild(gs: Dict[str, Any]):
+    # Ensure new keys exist for older state files
+    gs.setdefault("queue", [])
+    gs.setdefault("queue_shuffle", False)
+    if gs.get("current_round"):
+        upgrade_round(gs["current_round"])
 
 state: Dict[str, Any] = load_state()
 
+# Upgrade every guild once at startup, so gstate() doesn't have to check on each call.
+# Guild entries are keyed by their (numeric) ID; other top-level keys are caches.
+for _gid, _gs in state.items():
+    if _gid.isdigit() and isinstance(_gs, dict):
+        upgrade_guild(_gs)
+
+class Pending(IntEnum):
+    URL = 1
+    DESCRIPTION = 2
+
 # Tracks users awaiting URL or description
-# Format: { user_id: "awaiting_url" | "awaiting_description" }
-pending_submission: Dict[int, str] = {}
+# Format: { user_id: Pending.URL | Pending.DESCRIPTION }
+pending_submission: Dict[int, Pending] = {}
 
 def gstate(guild_id: int) -> Dict[str, Any]:
     gid = str(guild_id)
-    if gid not in state:
-        state[gid] = {
+    gs = state.get(gid)
+    if gs is None:
+        gs = state[gid] = {
             "players": [],
             "bot_channel": None,
             "current_round": None,
             "queue": [],
             "queue_shuffle": False,
         }
-    else:
-        # Ensure new keys exist for older state files
-        gs = state[gid]
-        if "queue" not in gs:
-            gs["queue"] = []
-        if "queue_shuffle" not in gs:
-            gs["queue_shuffle"] = False
-    return state[gid]
+    return gs
+
+
+# Reverse index of players in a running round, so DM handlers can find the
+# right guild without scanning every guild's state. A player can be in
+# running rounds in several guilds at once; the inner dict is used as an
+# insertion-ordered set, so lookups prefer the guild they were tracked in first.
+# Format: { user_id: {guild_id: None, ...} }
+player_active_round: Dict[int, Dict[int, None]] = {}
 
+def track_player(user_id: int, guild_id: int):
+    player_active_round.setdefault(user_id, {})[guild_id] = None
+
+def untrack_player(user_id: int, guild_id: int):
+    gids = player_active_round.get(user_id)
+    if gids is not None:
+        gids.pop(guild_id, None)
+        if not gids:
+            del player_active_round[user_id]
+
+for _gid, _gs in state.items():
+    if _gid.isdigit() and isinstance(_gs, dict) and _gs.get("current_round"):
+        for _pid in _gs["players"]:
+            track_player(_pid, int(_gid))
+
+def player_round(user_id: int, status: str) -> Optional[tuple[int, Dict[str, Any], Dict[str, Any]]]:
+    """
+    Finds the round that `user_id` is playing in, if it has the given status.
+    If several guilds match, the one the player was tracked in first wins.
+    Returns (guild_id, guild state, round), or None.
+    """
+    for gid in player_active_round.get(user_id, ()):
+        gs = gstate(gid)
+        r = gs["current_round"]
+        if r is not None and r["status"] == status:
+            return gid, gs, r
+    return None
+
+
+# Where a video ID can appear, in priority order: youtu.be/<id>, v=<id>,
+# shorts/<id>, then a trailing /<id> path segment. They're tried one at a time
+# because a single alternation would return the leftmost match instead.
+_YT_ID_RES = tuple(re.compile(p) for p in (
+    r"youtu\.be/([A-Za-z0-9_\-]{6,})",
+    r"v=([A-Za-z0-9_\-]{6,})",
+    r"shorts/([A-Za-z0-9_\-]{6,})",
+    r"/([A-Za-z0-9_\-]{6,})$",
+))
+
+# An 11-character video ID not followed by further ID characters.
+_YT_WATCH_ID_RE = re.compile(r"[A-Za-z0-9_\-]{11}(?![A-Za-z0-9_\-])")
 
 def extract_youtube_id(url: str) -> str:
-    m = re.search(r"youtu\.be/([A-Za-z0-9_\-]{6,})", url)
-    if m:
-        return m.group(1)
-    m = re.search(r"v=([A-Za-z0-9_\-]{6,})", url)
-    if m:
-        return m.group(1)
-    m = re.search(r"shorts/([A-Za-z0-9_\-]{6,})", url)
-    if m:
-        return m.group(1)
-    m = re.search(r"/([A-Za-z0-9_\-]{6,})$", url)
-    if m:
-        return m.group(1)
+    # Fast path for the common https://www.youtube.com/watch?v=<id> form. Only
+    # taken when it's what the patterns below would find anyway: no youtu.be/
+    # link, and no earlier v= in the URL.
+    i = url.find("watch?v=")
+    if i != -1 and url.find("v=") == i + len("watch?") and "youtu.be/" not in url:
+        m = _YT_WATCH_ID_RE.match(url, i + len("watch?v="))
+        if m:
+            return m.group()
+
+    for rx in _YT_ID_RES:
+        m = rx.search(url)
+        if m:
+            return m.group(1)
     return ""
 
 
-def playlist_url(submissions: List[Dict[str, Any]]) -> str:
-    ids = [extract_youtube_id(s["url"]) for s in submissions]
-    ids = [i for i in ids if i]
+def playlist_url_from_ids(video_ids: List[str]) -> str:
+    ids = [i for i in video_ids if i]
     if not ids:
         return "No valid submissions."
     return f"https://www.youtube.com/watch_videos?video_ids={','.join(ids)}"
 
 
+def playlist_url(submissions: List[Dict[str, Any]]) -> str:
+    """
+    Like playlist_url_from_ids, but re-parses each submission's URL.
+    Prefer playlist_url_from_ids when the video IDs are already known.
+    """
+    return playlist_url_from_ids([extract_youtube_id(s["url"]) for s in submissions])
+
+
 def pretty_link(text: str, url: str) -> str:
     """
-    Make a masked link that also uses <url> to suppress Discord previews.
+    Make a masked link. Messages containing these should be sent with
+    suppress_embeds=True so Discord doesn't add previews.
     """
-    return f"[{text}](<{url}>)"
+    return f"[{text}]({url})"
+
+
+VOTING_DM_HEADER = "🎵 Voting time!\nYou must distribute **10 points** across the following songs:\n\n"
+VOTING_DM_FOOTER = (
+    "\nSubmit your vote using:\n"
+    f"`{COMMAND_PREFIX}vote <entry_id>:<points> <entry_id>:<points> ...`\n"
+    f"Example: `{COMMAND_PREFIX}vote 1:5 3:3 5:2`"
+)
+
+def voting_dm_body(numbered: Dict[str, List[Any]]) -> str:
+    """
+    Builds the voting-instructions DM. It's identical for every player,
+    so build it once per round and send the same string to everyone.
+    """
+    entries = zip(numbered["title"], numbered["description"], numbered["url"])
+    fragments = [
+        f"**{idx}. {title}**\n"
+        + (f"_{desc}_\n" if desc else "")
+        + f"{pretty_link('Open on YouTube', url)}\n\n"
+        for idx, (title, desc, url) in enumerate(entries, start=1)
+    ]
+    return VOTING_DM_HEADER + "".join(fragments) + VOTING_DM_FOOTER
 
 
 # ============================================================
 # YOUTUBE TITLE FETCH
 # ============================================================
 
-async def fetch_youtube_title(video_id: str) -> str:
+# Shared HTTP session, so outbound requests reuse pooled keep-alive connections.
+# Created lazily because aiohttp sessions must be created inside the event loop.
+_http: Optional[aiohttp.ClientSession] = None
+
+async def get_http() -> aiohttp.ClientSession:
     """
-    Fetches the video title via the YouTube Data API.
-    Returns a placeholder title if the API fails.
+    Returns the shared aiohttp session, creating it on first use.
     """
-    if not YT_API_KEY:
-        return "<unknown title>"
+    global _http
+    if _http is None or _http.closed:
+        _http = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=32, ttl_dns_cache=300)
+        )
+    return _http
 
-    url = (
-        "https://www.googleapis.com/youtube/v3/videos"
-        f"?part=snippet&id={video_id}&key={YT_API_KEY}"
-    )
 
-    try:
-        async with aiohttp.ClientSession() as session:
+async def close_http():
+    global _http
+    if _http is not None:
+        await _http.close()
+        _http = None
+
+
+UNKNOWN_TITLE = "<unknown title>"
+
+# The Videos endpoint accepts at most this many comma-separated IDs per call.
+YT_IDS_PER_REQUEST = 50
+
+# Titles are cached in the state file so the same video submitted in a later
+# round doesn't hit the API again.
+# Format: { video_id: {"v": title, "t": unix time fetched} }
+TITLE_CACHE_TTL = 7 * 24 * 60 * 60
+# Oldest entries are evicted past this size, so the state file can't grow forever.
+TITLE_CACHE_MAX = 4096
+_title_cache: Dict[str, Dict[str, Any]] = state.setdefault("_yt_title_cache", {})
+
+
+async def fetch_youtube_titles(video_ids: List[str]) -> Dict[str, str]:
+    """
+    Fetches titles for several videos via the YouTube Data API, batching
+    up to 50 IDs per request. Cached titles younger than TITLE_CACHE_TTL are
+    returned without a request.
+    Returns a dict of video_id -> title. IDs that couldn't be fetched are omitted.
+    """
+    now = time.time()
+    titles: Dict[str, str] = {}
+    misses: List[str] = []
+
+    for vid in dict.fromkeys(video_ids):
+        cached = _title_cache.get(vid)
+        if cached and cached["t"] > now - TITLE_CACHE_TTL:
+            titles[vid] = cached["v"]
+        else:
+            misses.append(vid)
+
+    if not misses or not YT_API_KEY:
+        return titles
+
+    session = await get_http()
+    fetched = False
+
+    for start in range(0, len(misses), YT_IDS_PER_REQUEST):
+        chunk = misses[start:start + YT_IDS_PER_REQUEST]
+        url = (
+            "https://www.googleapis.com/youtube/v3/videos"
+            f"?part=snippet&id={','.join(chunk)}&key={YT_API_KEY}"
+        )
+
+        try:
             async with session.get(url) as resp:
-                data = await resp.json()
-                items = data.get("items", [])
-                if items:
-                    return items[0]["snippet"]["title"]
-    except Exception:
-        pass
+                data = json_loads(await resp.read())
+                for item in data.get("items", []):
+                    title = item["snippet"]["title"]
+                    titles[item["id"]] = title
+                    # Re-insert so the cache stays ordered oldest-fetched first
+                    _title_cache.pop(item["id"], None)
+                    _title_cache[item["id"]] = {"v": title, "t": now}
+                    if len(_title_cache) > TITLE_CACHE_MAX:
+                        del _title_cache[next(iter(_title_cache))]
+                    fetched = True
+        except Exception:
+            pass
+
+    if fetched:
+        save_state()
 
-    return "<unknown title>"
+    return titles
+
+
+async def fetch_youtube_title(video_id: str) -> str:
+    """
+    Fetches a single video title via the YouTube Data API.
+    Returns a placeholder title if the API fails.
+    """
+    titles = await fetch_youtube_titles([video_id])
+    return titles.get(video_id, UNKNOWN_TITLE)
 
 
 def get_text_channel(guild: discord.Guild, channel_id: int) -> Optional[discord.TextChannel]:
@@ -186,6 +546,19 @@ async def close_submissions_core(ctx: commands.Context, guild_id: int) -> Option
     if not r["submissions"]:
         return "Cannot close submissions: nobody has submitted yet."
 
+    # Retry any title lookups that failed at submission time, in one batched call
+    untitled = [s["video_id"] for s in r["submissions"].values() if s["title"] == UNKNOWN_TITLE]
+    if untitled:
+        titles = await fetch_youtube_titles(untitled)
+
+        # Another close (manual or automatic) may have run during the lookup
+        if gs.get("current_round") is not r or r["status"] != "collecting":
+            return "No collecting round."
+
+        for s in r["submissions"].values():
+            if s["video_id"] in titles:
+                s["title"] = titles[s["video_id"]]
+
     r["status"] = "voting"
     save_state()
 
@@ -201,68 +574,52 @@ async def close_submissions_core(ctx: commands.Context, guild_id: int) -> Option
     if channel is None:
         return f"The configured bot channel is invalid or not a text channel. Re-run {COMMAND_PREFIX}set_channel."
 
-    subs: List[Dict[str, Any]] = r["submissions"]
-    purl = playlist_url(subs)
-    playlist_link = pretty_link("View the playlist here!", purl)
-
-    # Build numbered submissions as a LIST (index = entry_id - 1)
-    numbered: List[Dict[str, Any]] = []
-    for sub in subs:
-        numbered.append({
-            "player_id": sub["player_id"],
-            "url": sub["url"],
-            "video_id": sub["video_id"],
-            "title": sub["title"],
-            "description": sub.get("description", ""),
-        })
+    # Build numbered submissions as parallel columns (index = entry_id - 1).
+    # They replace the submissions list rather than duplicating it.
+    numbered = number_submissions(r.pop("submissions"))
     r["numbered_submissions"] = numbered
     save_state()
 
-    msg = f"🎵 **Submissions closed!** Voting begins. 🎺 {playlist_link} 🪉"
-    for i, sub in enumerate(numbered, start=1):
-        sub_link = pretty_link(sub['title'], sub['url'])
-        msg += f"\n- **{i}**: {sub_link}"
-    await channel.send(msg)
+    purl = playlist_url_from_ids(numbered["video_id"])
+    playlist_link = pretty_link("View the playlist here!", purl)
 
-    # DM players with voting instructions
-    for pid in gs["players"]:
-        user = guild.get_member(pid)
-        if not user:
-            continue
-        try:
-            msg = "🎵 Voting time!\nYou must distribute **10 points** across the following songs:\n\n"
-
-            for idx, sub in enumerate(numbered, start=1):
-                title = sub["title"]
-                desc = sub.get("description", "")
-                msg += f"**{idx}. {title}**\n"
-                if desc:
-                    msg += f"_{desc}_\n"
-                msg += f"{pretty_link('Open on YouTube', sub['url'])}\n\n"
-
-            msg += (
-                "\nSubmit your vote using:\n"
-                f"`{COMMAND_PREFIX}vote <entry_id>:<points> <entry_id>:<points> ...`\n"
-                f"Example: `{COMMAND_PREFIX}vote 1:5 3:3 5:2`"
-            )
-            await user.send(msg)
-        except Exception:
-            pass
+    titles: List[str] = numbered["title"]
+    urls: List[str] = numbered["url"]
 
-    await channel.send("Pre-downloading submission audio...")
+    # Start pre-downloading straight away, so it overlaps the announcements
+    # and DMs below. Use guild-specific basenames.
+    downloads = [
+        start_audio_download(url, audio_basename(guild.id, idx, video_id))
+        for idx, (url, video_id) in enumerate(zip(urls, numbered["video_id"]), start=1)
+    ]
 
-    for idx, sub in enumerate(numbered, start=1):
-        url = sub["url"]
+    parts = [f"🎵 **Submissions closed!** Voting begins. 🎺 {playlist_link} 🪉"]
+    for i, (title, url) in enumerate(zip(titles, urls), start=1):
+        sub_link = pretty_link(title, url)
+        parts.append(f"\n- **{i}**: {sub_link}")
+    await channel.send("".join(parts), suppress_embeds=True)
 
-        await channel.send(f"Downloading audio for submission {idx}: **{sub['title']}**")
+    # DM players with voting instructions (the message is the same for everyone)
+    dm_body = voting_dm_body(numbered)
 
-        # Use a guild-specific basename
-        basename = f"{guild.id}_{idx}"
-        filepath = await download_audio(url, basename)
+    dm_sem = asyncio.Semaphore(MAX_CONCURRENT_DMS)
 
-        if filepath is None:
-            await channel.send(f"Failed to download audio for: **{sub['title']}**")
-            continue
+    async def _dm(pid: int):
+        user = guild.get_member(pid)
+        if not user:
+            return
+        async with dm_sem:
+            await user.send(dm_body, suppress_embeds=True)
+
+    # Failed DMs (e.g. closed DMs) are ignored, as before
+    await asyncio.gather(*(_dm(pid) for pid in gs["players"]), return_exceptions=True)
+
+    await channel.send(f"Pre-downloading audio for {len(urls)} submissions...")
+
+    results = await asyncio.gather(*downloads)
+    failed = [title for title, path in zip(titles, results) if path is None]
+    if failed:
+        await channel.send("Failed to download audio for: " + ", ".join(f"**{t}**" for t in failed))
 
     await channel.send("All available audio downloaded. 🎸")
 
@@ -287,21 +644,15 @@ async def finish_round_core(guild_id: int) -> Optional[str]:
     if not r["votes"]:
         return "Cannot finish voting: nobody has voted yet."
 
-    subs: List[Dict[str, Any]] = r["numbered_submissions"]
-    n = len(subs)
-    scores = [0] * n  # index = entry_id - 1
+    numbered: Dict[str, List[Any]] = r["numbered_submissions"]
+    player_ids: List[int] = numbered["player_id"]
+    n = len(player_ids)
+    # Each distribution is a list of points aligned with the entries, so the
+    # scores are just the column sums (index = entry_id - 1)
+    scores = [sum(col) for col in zip(*r["votes"].values())]
 
-    for v in r["votes"]:
-        for sid, pts in v["distribution"].items():
-            idx = int(sid) - 1
-            if 0 <= idx < n:
-                scores[idx] += pts
-
-    ordered = sorted(
-        [(sid, scores[sid - 1]) for sid in range(1, n + 1)],
-        key=lambda x: x[1],
-        reverse=True,
-    )
+    # Entry indices ordered by score, highest first (ties keep entry order)
+    ordered = sorted(range(n), key=scores.__getitem__, reverse=True)
 
     channel_id = gs.get("bot_channel")
     if channel_id is None:
@@ -311,29 +662,38 @@ async def finish_round_core(guild_id: int) -> Optional[str]:
     if channel is None:
         return f"The configured bot channel is invalid or not a text channel. Re-run {COMMAND_PREFIX}set_channel."
 
-    msg = "🎤 **Broken Microphone – Round Results**\n"
-    msg += f"Prompt: **{r['prompt']}**\n\n"
-
-    for rank, (sid, pts) in enumerate(ordered, start=1):
-        sub = subs[sid - 1]
-        url = sub["url"]
-        title = sub["title"]
-        description = sub.get("description", None)
-        submitter_member = guild.get_member(sub["player_id"])
-        submitter_name = submitter_member.display_name if submitter_member else f"User {sub['player_id']}"
-
-        msg += (
+    parts = [
+        "🎤 **Broken Microphone – Round Results**\n",
+        f"Prompt: **{r['prompt']}**\n\n",
+    ]
+
+    # Resolve every submitter's display name once, up front
+    submitter_names: Dict[int, str] = {}
+    for pid in player_ids:
+        member = guild.get_member(pid)
+        submitter_names[pid] = member.display_name if member else f"User {pid}"
+
+    for rank, idx in enumerate(ordered, start=1):
+        pts = scores[idx]
+        url = numbered["url"][idx]
+        title = numbered["title"][idx]
+        description = numbered["description"][idx]
+        submitter_name = submitter_names[player_ids[idx]]
+
+        parts.append(
             f"**{rank}. {pts} pts — {submitter_name}**\n"
             f"**{title}**\n"
             f"{pretty_link('Open on YouTube', url)}\n"
         )
         if description:
-            msg += f"_{description}_\n"
-        msg += "\n"
+            parts.append(f"_{description}_\n")
+        parts.append("\n")
 
-    await channel.send(msg)
+    await channel.send("".join(parts), suppress_embeds=True)
 
     gs["current_round"] = None
+    for pid in gs["players"]:
+        untrack_player(pid, guild_id)
     save_state()
     return None
 
@@ -342,9 +702,20 @@ async def finish_round_core(guild_id: int) -> Optional[str]:
 # BOT EVENTS / COMMANDS
 # ============================================================
 
+@bot.event
+async def on_command_error(ctx: commands.Context, error: commands.CommandError):
+    if isinstance(error, commands.NoPrivateMessage):
+        await ctx.send("This command can only be used in a server.")
+    elif isinstance(error, commands.PrivateMessageOnly):
+        await ctx.send("This command can only be used in DMs.")
+    else:
+        # Fall back to discord.py's default handling (logging the error)
+        await commands.Bot.on_command_error(bot, ctx, error)
+
+
 @bot.event
 async def on_ready():
-    print(f"Logged in as {bot.user}")
+    log.info("Logged in as %s", bot.user)
     await reset_status()
 
 
@@ -354,12 +725,12 @@ async def reset_status():
         name=f"🎸 Say {COMMAND_PREFIX}help for usage info"
     ))
 
-async def playing_status(sub):
+async def playing_status(title: str, description: str, url: str):
     await bot.change_presence(activity=discord.Activity(
         type=discord.ActivityType.listening,
-        name=f"🎶 Listening to {sub['title']} 🎶",
-        details=sub['description'],
-        url=sub['url']
+        name=f"🎶 Listening to {title} 🎶",
+        details=description,
+        url=url
     ))
 
 
@@ -368,14 +739,15 @@ async def playing_status(sub):
 # --------------------------------------------
 
 @bot.command(help="Join the Broken Microphone league in this server.")
+@commands.guild_only()
 async def join(ctx: commands.Context):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
 
     gs = gstate(ctx.guild.id)
     if ctx.author.id not in gs["players"]:
         gs["players"].append(ctx.author.id)
+        if gs["current_round"] is not None:
+            track_player(ctx.author.id, ctx.guild.id)
         save_state()
         await ctx.send("You have joined the league.")
     else:
@@ -383,14 +755,14 @@ async def join(ctx: commands.Context):
 
 
 @bot.command(help="Leave the Broken Microphone league in this server.")
+@commands.guild_only()
 async def leave(ctx: commands.Context):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
 
     gs = gstate(ctx.guild.id)
     if ctx.author.id in gs["players"]:
         gs["players"].remove(ctx.author.id)
+        untrack_player(ctx.author.id, ctx.guild.id)
         save_state()
         await ctx.send("You have left the league.")
     else:
@@ -402,10 +774,9 @@ async def leave(ctx: commands.Context):
 # --------------------------------------------
 
 @bot.command(help="Show the current round status and who still needs to submit or vote.")
+@commands.guild_only()
 async def status(ctx: commands.Context):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
 
     gs = gstate(ctx.guild.id)
     r = gs.get("current_round")
@@ -415,27 +786,31 @@ async def status(ctx: commands.Context):
         return
 
     players = gs["players"]
-    submissions = {s["player_id"] for s in r.get("submissions", [])}
-    voters = {v["voter_id"] for v in r.get("votes", [])}
-
-    missing_submissions = [p for p in players if p not in submissions]
-    missing_votes = [p for p in players if p not in voters]
+    if "numbered_submissions" in r:
+        submitters = r["numbered_submissions"]["player_id"]
+        submitted_count = len(submitters)
+        submitted = frozenset(submitters)
+        missing_submissions = [p for p in players if p not in submitted]
+    else:
+        # Submissions and votes are keyed by str(user_id)
+        submitted_count = len(r["submissions"])
+        missing_submissions = [p for p in players if str(p) not in r["submissions"]]
+    votes = r.get("votes", {})
+    missing_votes = [p for p in players if str(p) not in votes]
+
+    # Resolve every player's display name once; both lists below draw from it
+    names: Dict[int, str] = {}
+    for pid in players:
+        member = ctx.guild.get_member(pid)
+        names[pid] = member.display_name if member else f"User {pid}"
 
     def fmt_users(ids: List[int]) -> str:
-        if ctx.guild is None:
-            return "(Error! Not in a server)"
-        if not ids:
-            return "None"
-        names = []
-        for uid in ids:
-            m = ctx.guild.get_member(uid)
-            names.append(m.display_name if m else f"User {uid}")
-        return ", ".join(names)
+        return ", ".join(names[uid] for uid in ids) or "None"
 
     msg = f"**Round status**\nPrompt: **{r['prompt']}**\nStatus: **{r['status']}**\n\n"
     msg += f"Players: {len(players)}\n"
-    msg += f"Submissions: {len(submissions)}/{len(players)}\n"
-    msg += f"Votes: {len(voters)}/{len(players)}\n\n"
+    msg += f"Submissions: {submitted_count}/{len(players)}\n"
+    msg += f"Votes: {len(votes)}/{len(players)}\n\n"
 
     if r["status"] == "collecting":
         msg += f"Players who still need to submit:\n{fmt_users(missing_submissions)}"
@@ -451,10 +826,9 @@ async def status(ctx: commands.Context):
 # --------------------------------------------
 
 @bot.command(help="Set this text channel as the Broken Microphone announcement channel.")
+@commands.guild_only()
 async def set_channel(ctx: commands.Context):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
 
     if not isinstance(ctx.channel, discord.TextChannel):
         await ctx.send("This channel cannot be used as the bot channel.")
@@ -471,10 +845,9 @@ async def set_channel(ctx: commands.Context):
 # --------------------------------------------
 
 @bot.command(name="queue_add", help="Add a prompt to the round queue.")
+@commands.guild_only()
 async def queue_add(ctx: commands.Context, *, prompt: str):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
     prompt = prompt.strip()
     if not prompt:
         await ctx.send("Prompt cannot be empty.")
@@ -486,10 +859,9 @@ async def queue_add(ctx: commands.Context, *, prompt: str):
 
 
 @bot.command(name="queue_view", help="View the current round queue.")
+@commands.guild_only()
 async def queue_view(ctx: commands.Context):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
     gs = gstate(ctx.guild.id)
     q = gs["queue"]
     shuffle = gs["queue_shuffle"]
@@ -503,10 +875,9 @@ async def queue_view(ctx: commands.Context):
 
 
 @bot.command(name="queue_remove", help="Remove a prompt from the queue by its index (1-based).")
+@commands.guild_only()
 async def queue_remove(ctx: commands.Context, index: int):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
     gs = gstate(ctx.guild.id)
     q = gs["queue"]
     if index < 1 or index > len(q):
@@ -518,10 +889,9 @@ async def queue_remove(ctx: commands.Context, index: int):
 
 
 @bot.command(name="queue_shuffle", help="Turn queue shuffle on/off, or toggle if no argument is given.")
+@commands.guild_only()
 async def queue_shuffle(ctx: commands.Context, mode: str = ""):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
     gs = gstate(ctx.guild.id)
 
     if mode.lower() == "on":
@@ -546,19 +916,16 @@ async def queue_shuffle(ctx: commands.Context, mode: str = ""):
         "from the queue (respecting shuffle mode)."
     )
 )
+@commands.guild_only()
 async def start_round(ctx: commands.Context, *, prompt: str = ""):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
 
     gs = gstate(ctx.guild.id)
 
-    # Delete all old audio files
-    for f in os.listdir(AUDIO_DIR):
-        try:
-            os.remove(os.path.join(AUDIO_DIR, f))
-        except Exception:
-            pass
+    # Delete all old audio files, off the event loop, and forget the previous
+    # round's in-flight downloads so they can't be picked up for this one
+    await asyncio.to_thread(purge_audio_dir)
+    forget_audio_downloads(ctx.guild.id)
 
     if gs["bot_channel"] is None:
         await ctx.send(f"Set the bot channel first using {COMMAND_PREFIX}set_channel.")
@@ -585,9 +952,11 @@ async def start_round(ctx: commands.Context, *, prompt: str = ""):
     gs["current_round"] = {
         "prompt": prompt,
         "status": "collecting",
-        "submissions": [],  # list of {player_id, url, video_id, title, description}
-        "votes": [],        # list of {voter_id, distribution: {entry_id: points}}
+        "submissions": {},  # str(player_id) -> {url, video_id, title, description}
+        "votes": {},        # str(voter_id) -> [points per entry]
     }
+    for pid in gs["players"]:
+        track_player(pid, ctx.guild.id)
     save_state()
 
     channel_id = gs.get("bot_channel")
@@ -603,20 +972,41 @@ async def start_round(ctx: commands.Context, *, prompt: str = ""):
     await channel.send(f"🎵 **New Broken Microphone round started!**\nPrompt: **{prompt}**")
 
     # DM each player asking for submission
-    for pid in gs["players"]:
-        user = ctx.guild.get_member(pid)
-        if user:
-            try:
-                await user.send(
-                    f"🎵 New Broken Microphone round started!\n"
-                    f"Prompt: **{prompt}**\n\n"
-                    f"Please submit your song by sending **just a YouTube URL**, OR use:\n"
-                    f"`{COMMAND_PREFIX}submit_song <url>`\n\n"
-                    f"After submitting a URL, you may send a **short description** (1–3 sentences) explaining your choice."
-                )
-                pending_submission[user.id] = "awaiting_url"
-            except Exception:
-                pass
+    dm_text = (
+        f"🎵 New Broken Microphone round started!\n"
+        f"Prompt: **{prompt}**\n\n"
+        f"Please submit your song by sending **just a YouTube URL**, OR use:\n"
+        f"`{COMMAND_PREFIX}submit_song <url>`\n\n"
+        f"After submitting a URL, you may send a **short description** (1–3 sentences) explaining your choice."
+    )
+    # Large guilds may not have every member cached yet; fetch them all once
+    # so no player is silently skipped
+    if not ctx.guild.chunked:
+        await ctx.guild.chunk()
+    members = [m for m in map(ctx.guild.get_member, gs["players"]) if m]
+
+    # Mark everyone as pending up front so a fast reply isn't dropped,
+    # remembering what each player was pending on before
+    previous = {user.id: pending_submission.get(user.id) for user in members}
+    for user in members:
+        pending_submission[user.id] = Pending.URL
+
+    dm_sem = asyncio.Semaphore(MAX_CONCURRENT_DMS)
+
+    async def _dm(user: discord.Member):
+        async with dm_sem:
+            await user.send(dm_text)
+
+    results = await asyncio.gather(*(_dm(m) for m in members), return_exceptions=True)
+    # Players we couldn't DM go back to whatever they were pending on,
+    # unless they've already moved on in the meantime
+    for user, result in zip(members, results):
+        if isinstance(result, Exception) and pending_submission.get(user.id) is Pending.URL:
+            prev = previous[user.id]
+            if prev is None:
+                del pending_submission[user.id]
+            else:
+                pending_submission[user.id] = prev
 
 
 # --------------------------------------------
@@ -624,73 +1014,60 @@ async def start_round(ctx: commands.Context, *, prompt: str = ""):
 # --------------------------------------------
 
 @bot.command(help="(DM only) Submit your song URL for the current round.")
+@commands.dm_only()
 async def submit_song(ctx: commands.Context, url: str):
-    if ctx.guild is not None:
-        await ctx.send("Submit songs via DM only.")
+    found = player_round(ctx.author.id, "collecting")
+    if found is None:
+        await ctx.send("No active collecting round found for you.")
         return
+    gid, gs, r = found
 
-    for gid, gs in state.items():
-        if not isinstance(gs, dict):
-            continue
-        if ctx.author.id not in gs.get("players", []):
-            continue
-
-        r = gs.get("current_round")
-        if r is None or r["status"] != "collecting":
-            continue
-
-        video_id = extract_youtube_id(url)
-        if not video_id:
-            await ctx.send("Invalid YouTube link.")
-            return
-
-        # canonical URL
-        url = f"https://www.youtube.com/watch?v={video_id}"
-
-        title = await fetch_youtube_title(video_id)
+    video_id = extract_youtube_id(url)
+    if not video_id:
+        await ctx.send("Invalid YouTube link.")
+        return
 
-        # store / update
-        existing = None
-        for s in r["submissions"]:
-            if s["player_id"] == ctx.author.id:
-                existing = s
-                break
+    # canonical URL
+    url = f"https://www.youtube.com/watch?v={video_id}"
 
-        if existing:
-            existing["url"] = url
-            existing["video_id"] = video_id
-            existing["title"] = title
-        else:
-            r["submissions"].append({
-                "player_id": ctx.author.id,
-                "url": url,
-                "video_id": video_id,
-                "title": title,
-                "description": "",
-            })
+    title = await fetch_youtube_title(video_id)
 
-        save_state()
+    # Submissions may have closed while the title was being fetched
+    if gs.get("current_round") is not r or r["status"] != "collecting" or "submissions" not in r:
+        await ctx.send("Submissions are closed for this round.")
+        return
 
-        # progress info
-        total_players = len(gs["players"])
-        submitted_ids = {s["player_id"] for s in r["submissions"]}
-        submitted_count = len(submitted_ids)
+    # store / update
+    existing = r["submissions"].get(str(ctx.author.id))
+    if existing:
+        existing["url"] = url
+        existing["video_id"] = video_id
+        existing["title"] = title
+    else:
+        r["submissions"][str(ctx.author.id)] = {
+            "url": url,
+            "video_id": video_id,
+            "title": title,
+            "description": "",
+        }
 
-        msg = (
-            f"Song received:\n**{title}**\n"
-            f"Now please send a short description.\n\n"
-            f"Submissions so far: {submitted_count}/{total_players} players."
-        )
-        await ctx.send(msg)
-        pending_submission[ctx.author.id] = "awaiting_description"
+    save_state()
 
-        # auto-close if everyone submitted and at least one submission exists
-        if submitted_count == total_players and submitted_count > 0:
-            await close_submissions_core(ctx, int(gid))
+    # progress info
+    total_players = len(gs["players"])
+    submitted_count = len(r["submissions"])
 
-        return
+    msg = (
+        f"Song received:\n**{title}**\n"
+        f"Now please send a short description.\n\n"
+        f"Submissions so far: {submitted_count}/{total_players} players."
+    )
+    await ctx.send(msg)
+    pending_submission[ctx.author.id] = Pending.DESCRIPTION
 
-    await ctx.send("No active collecting round found for you.")
+    # auto-close if everyone submitted and at least one submission exists
+    if submitted_count == total_players and submitted_count > 0:
+        await close_submissions_core(ctx, gid)
 
 
 # --------------------------------------------
@@ -699,15 +1076,17 @@ async def submit_song(ctx: commands.Context, url: str):
 
 @bot.event
 async def on_message(message: discord.Message):
-    # First let commands run
-    await bot.process_commands(message)
+    # Cheap filters first, so most messages never build a command Context
+    if message.author.bot:
+        return
 
-    # Only interested in DMs
-    if message.guild is not None:
+    if message.content.startswith(COMMAND_PREFIX):
+        await bot.process_commands(message)
         return
 
+    # Otherwise, only interested in DMs from users we're waiting on
     user = message.author
-    if user.bot:
+    if message.guild is not None or user.id not in pending_submission:
         return
 
     # If this is a command (starts with prefix), don't treat it as URL/description
@@ -715,8 +1094,10 @@ async def on_message(message: discord.Message):
     if content.startswith(COMMAND_PREFIX):
         return
 
+    pending = pending_submission[user.id]
+
     # If user is expecting a URL
-    if pending_submission.get(user.id) == "awaiting_url":
+    if pending is Pending.URL:
         url = content
 
         if "youtu" not in url:
@@ -733,20 +1114,17 @@ async def on_message(message: discord.Message):
         return
 
     # If user is expecting a description
-    if pending_submission.get(user.id) == "awaiting_description":
+    if pending is Pending.DESCRIPTION:
         desc = content
 
         # Store description
-        for _, gs in state.items():
-            if not isinstance(gs, dict):
-                continue
-            r = gs.get("current_round")
-            if r and user.id in gs.get("players", []) and r["status"] == "collecting":
-                for s in r["submissions"]:
-                    if s["player_id"] == user.id:
-                        s["description"] = desc
-                        save_state()
-                        break
+        found = player_round(user.id, "collecting")
+        if found is not None:
+            _, _, r = found
+            s = r["submissions"].get(str(user.id))
+            if s is not None:
+                s["description"] = desc
+                save_state()
 
         await user.send("Description received!")
         del pending_submission[user.id]
@@ -758,10 +1136,9 @@ async def on_message(message: discord.Message):
 # --------------------------------------------
 
 @bot.command(help="Manually close submissions and start voting (if possible).")
+@commands.guild_only()
 async def close_submissions(ctx: commands.Context):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
 
     err = await close_submissions_core(ctx, ctx.guild.id)
     if err:
@@ -772,94 +1149,93 @@ async def close_submissions(ctx: commands.Context):
 # VOTING (DM only)
 # --------------------------------------------
 
+# One `<entry_id>:<points>` allocation
+_ALLOC_RE = re.compile(r"\A(-?\d+):(-?\d+)\Z")
+
 @bot.command(help=f"(DM only) Vote by distributing 10 points, e.g. `{COMMAND_PREFIX}vote 1:5 3:3 5:2`.")
+@commands.dm_only()
 async def vote(ctx: commands.Context, *allocations: str):
-    if ctx.guild is not None:
-        await ctx.send("Vote via DM only.")
+    found = player_round(ctx.author.id, "voting")
+    if found is None:
+        await ctx.send("No active voting round found.")
         return
+    gid, gs, r = found
 
-    for gid, gs in state.items():
-        if not isinstance(gs, dict):
-            continue
-        r = gs.get("current_round")
-        if r and ctx.author.id in gs.get("players", []) and r["status"] == "voting":
-            numbered: List[Dict[str, Any]] = r["numbered_submissions"]
-
-            # Parse allocations
-            dist: Dict[int, int] = {}
-            total = 0
-
-            for a in allocations:
-                if ":" not in a:
-                    await ctx.send("Invalid format. Use e.g. `1:5 3:2`.")
-                    return
-                sid_str, pts_str = a.split(":", 1)
-                try:
-                    sid = int(sid_str)
-                    pts = int(pts_str)
-                except ValueError:
-                    await ctx.send("Invalid number.")
-                    return
-
-                if sid < 1 or sid > len(numbered):
-                    await ctx.send(f"Invalid entry ID: {sid}")
-                    return
-                if pts < 0:
-                    await ctx.send("Points must be non-negative.")
-                    return
-
-                dist[sid] = pts
-                total += pts
-
-            if total != 10:
-                await ctx.send("Total points must be exactly **10**.")
-                return
+    numbered: Dict[str, List[Any]] = r["numbered_submissions"]
+    n = len(numbered["player_id"])
 
-            # prevent voting for own submission, unless we're in debug mode.
-            for sid in dist.keys():
-                sub = numbered[sid - 1]
-                if sub["player_id"] == ctx.author.id:
-                    if DEBUG:
-                        await ctx.send("You cannot vote for your own submission, but we're in debug mode so it's okay.")
-                    else:
-                        await ctx.send("You cannot vote for your own submission.")
-                        return
-
-            # Save vote (overwrite previous)
-            r["votes"] = [v for v in r["votes"] if v["voter_id"] != ctx.author.id]
-            r["votes"].append({
-                "voter_id": ctx.author.id,
-                "distribution": dist,
-            })
-            save_state()
-
-            # progress info
-            total_players = len(gs["players"])
-            voter_ids = {v["voter_id"] for v in r["votes"]}
-            voter_count = len(voter_ids)
-
-            # Confirmation
-            sorted_items = sorted(dist.items(), key=lambda x: x[1], reverse=True)
-
-            msg = "Your vote has been recorded:\n\n"
-            for rank, (sid, pts) in enumerate(sorted_items, start=1):
-                sub = numbered[sid - 1]
-                title = sub["title"]
-                msg += f"{rank}. **{title}** — {pts} point"
-                if pts != 1:
-                    msg += "s"
-                msg += "\n"
-
-            msg += f"\nVotes so far: {voter_count}/{total_players} players."
-            await ctx.send(msg)
-
-            # auto-finish if everyone has voted and at least one vote exists
-            if voter_count == total_players and voter_count > 0:
-                await finish_round_core(int(gid))
+    # Entries the voter submitted themselves
+    own_sids = {sid for sid, pid in enumerate(numbered["player_id"], start=1) if pid == ctx.author.id}
 
+    # Parse allocations
+    dist: Dict[int, int] = {}
+    total = 0
+    voted_own = False
+
+    for a in allocations:
+        m = _ALLOC_RE.match(a)
+        if m is None:
+            if ":" not in a:
+                await ctx.send("Invalid format. Use e.g. `1:5 3:2`.")
+            else:
+                await ctx.send("Invalid number.")
             return
+        sid, pts = map(int, m.groups())
 
-    await ctx.send("No active voting round found.")
+        if sid < 1 or sid > n:
+            await ctx.send(f"Invalid entry ID: {sid}")
+            return
+        if pts < 0:
+            await ctx.send("Points must be non-negative.")
+            return
+
+        # prevent voting for own submission, unless we're in debug mode.
+        if sid in own_sids:
+            if not DEBUG:
+                await ctx.send("You cannot vote for your own submission.")
+                return
+            voted_own = True
+
+        dist[sid] = pts
+        total += pts
+
+    if total != 10:
+        await ctx.send("Total points must be exactly **10**.")
+        return
+
+    if voted_own:
+        await ctx.send("You cannot vote for your own submission, but we're in debug mode so it's okay.")
+
+    # Store points as a list aligned with the entries (index = entry_id - 1)
+    points = [0] * n
+    for sid, pts in dist.items():
+        points[sid - 1] = pts
+
+    # Save vote (overwrite previous)
+    r["votes"][str(ctx.author.id)] = points
+    save_state()
+
+    # progress info
+    total_players = len(gs["players"])
+    voter_count = len(r["votes"])
+
+    # Confirmation
+    sorted_items = sorted(dist.items(), key=lambda x: x[1], reverse=True)
+
+    msg = "Your vote has been recorded:\n\n"
+    for rank, (sid, pts) in enumerate(sorted_items, start=1):
+        title = numbered["title"][sid - 1]
+        msg += f"{rank}. **{title}** — {pts} point"
+        if pts != 1:
+            msg += "s"
+        msg += "\n"
+
+    msg += f"\nVotes so far: {voter_count}/{total_players} players."
+    await ctx.send(msg)
+
+    # auto-finish if everyone has voted and at least one vote exists
+    if voter_count == total_players and voter_count > 0:
+        await finish_round_core(gid)
 
 
 # --------------------------------------------
@@ -867,10 +1243,9 @@ async def vote(ctx: commands.Context, *allocations: str):
 # --------------------------------------------
 
 @bot.command(help="Manually finish the voting phase and reveal round results (if possible).")
+@commands.guild_only()
 async def finish_round(ctx: commands.Context):
-    if ctx.guild is None:
-        await ctx.send("This command can only be used in a server.")
-        return
+    assert ctx.guild is not None
 
     err = await finish_round_core(ctx.guild.id)
     if err:
@@ -884,6 +1259,93 @@ async def finish_round(ctx: commands.Context):
 # AUDIO PLAYBACK
 # --------------------------------------------
 
+def audio_basename(guild_id: int, sid: int, video_id: str) -> str:
+    """
+    File name (without extension) for a submission's audio. It includes the
+    video ID, so a download left over from an earlier round can never be
+    mistaken for, or write over, a different song in the same slot.
+    """
+    return f"{guild_id}_{sid}_{video_id}"
+
+# Downloads currently in flight, keyed by (basename, url), so `listen` can wait
+# for a pre-download instead of starting a second one into the same file.
+audio_downloads: Dict[tuple[str, str], asyncio.Task[Optional[str]]] = {}
+
+def start_audio_download(video_url: str, basename: str) -> asyncio.Task[Optional[str]]:
+    """
+    Starts downloading in the background, or returns the download of
+    `video_url` into `basename` that's already in flight.
+    Concurrency is capped by the size of the download thread pool.
+    """
+    key = (basename, video_url)
+    task = audio_downloads.get(key)
+    if task is None:
+        task = asyncio.create_task(download_audio(video_url, basename))
+        audio_downloads[key] = task
+
+        def _done(t: asyncio.Task[Optional[str]]):
+            if audio_downloads.get(key) is t:
+                del audio_downloads[key]
+
+        task.add_done_callback(_done)
+    return task
+
+def forget_audio_downloads(guild_id: int):
+    """
+    Drops a guild's in-flight downloads from audio_downloads. They aren't
+    cancelled, since the worker thread would keep running anyway; anything
+    still awaiting them gets their result as usual.
+    """
+    prefix = f"{guild_id}_"
+    for key in [k for k in audio_downloads if k[0].startswith(prefix)]:
+        del audio_downloads[key]
+
+def purge_audio_dir():
+    """
+    Deletes every file in AUDIO_DIR. Blocking, so run it in a thread.
+    """
+    with os.scandir(AUDIO_DIR) as it:
+        for entry in it:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+
+# yt-dlp downloads get their own worker threads, so they can't starve the default
+# executor that state writes use. Threads (not processes) are enough: the download
+# is network-bound and the audio conversion runs in an ffmpeg subprocess anyway.
+_download_pool = ThreadPoolExecutor(
+    max_workers=MAX_CONCURRENT_DOWNLOADS,
+    thread_name_prefix="bm-download",
+)
+
+_ydl_local = threading.local()
+
+def thread_ydl() -> yt_dlp.YoutubeDL:
+    """
+    Returns the calling thread's YoutubeDL, creating it on first use.
+    Constructing one loads all the extractors, so each download thread keeps
+    its own and reuses it. Only the output template changes per download.
+    """
+    ydl = getattr(_ydl_local, "ydl", None)
+    if ydl is None:
+        ydl_opts: dict[str, Any] = {
+            "format": "bestaudio/best",
+            "quiet": True,
+            "no_warnings": True,
+            "postprocessors": [
+                {
+                    "key": "FFmpegExtractAudio",
+                    "preferredcodec": "m4a",
+                }
+            ],
+            # ――― Size limit enforcement ―――
+            "overwrites": True,
+            "file_size_limit": MAX_AUDIO_MB * 1024 * 1024,  # bytes
+        }
+        ydl = _ydl_local.ydl = yt_dlp.YoutubeDL(ydl_opts)  # type: ignore
+    return ydl
+
 async def download_audio(video_url: str, basename: str) -> Optional[str]:
     """
     Downloads audio via yt-dlp into AUDIO_DIR.
@@ -891,34 +1353,18 @@ async def download_audio(video_url: str, basename: str) -> Optional[str]:
     Returns filepath or None.
     """
 
-    print(f"Downloading {video_url} to {basename}")
+    log.info("Downloading %s to %s", video_url, basename)
     out_noext = os.path.join(AUDIO_DIR, basename)
     final_path = f"{out_noext}.m4a"
 
-    ydl_opts: dict[str, Any] = {
-        "format": "bestaudio/best",
-        "outtmpl": out_noext + ".%(ext)s",
-        "quiet": True,
-        "no_warnings": True,
-        "postprocessors": [
-            {
-                "key": "FFmpegExtractAudio",
-                "preferredcodec": "m4a",
-            }
-        ],
-        # ――― Size limit enforcement ―――
-        "overwrites": True,
-        "file_size_limit": MAX_AUDIO_MB * 1024 * 1024,  # bytes
-    }
-
     def do_download():
-        yt_dlp.YoutubeDL(ydl_opts).download([video_url])  # type: ignore
+        ydl = thread_ydl()
+        ydl.params["outtmpl"]["default"] = out_noext + ".%(ext)s"
+        ydl.download([video_url])
 
     try:
-        loop = asyncio.get_event_loop()
-
         # yt-dlp raises an exception if the file exceeds file_size_limit
-        await loop.run_in_executor(None, do_download)
+        await asyncio.get_running_loop().run_in_executor(_download_pool, do_download)
 
         # After processing, ensure the file exists
         if os.path.exists(final_path):
@@ -927,14 +1373,13 @@ async def download_audio(video_url: str, basename: str) -> Optional[str]:
             return None
 
     except Exception as e:
-        print("Audio download error:", e)
+        log.warning("Audio download error: %s", e)
         return None
 
 @bot.command(help="Stop playing audio and disconnect the bot from voice.")
+@commands.guild_only()
 async def stop(ctx: commands.Context):
-    if ctx.guild is None:
-        await ctx.send("This command must be used in the server.")
-        return
+    assert ctx.guild is not None
 
     vc = ctx.guild.voice_client
     if not isinstance(vc, discord.VoiceClient):
@@ -971,17 +1416,26 @@ async def play_audio_in_channel(channel: discord.VoiceChannel, filepath: str):
         voice.stop()
 
     source = discord.FFmpegPCMAudio(filepath)
-    voice.play(source)
+
+    # discord.py calls `after` from its audio thread when playback ends
+    # (or is stopped), so hand the result back to the event loop
+    loop = asyncio.get_running_loop()
+    finished: asyncio.Future[Optional[Exception]] = loop.create_future()
+
+    def after(err: Optional[Exception]):
+        loop.call_soon_threadsafe(lambda: finished.done() or finished.set_result(err))
+
+    voice.play(source, after=after)
 
     # Wait until finished
-    while voice.is_playing():
-        await asyncio.sleep(0.5)
+    err = await finished
+    if err is not None:
+        raise err
 
 @bot.command(help=f"Listen to submissions. Use `{COMMAND_PREFIX}listen` for all or `{COMMAND_PREFIX}listen <index>` for one.")
+@commands.guild_only()
 async def listen(ctx: commands.Context, index: int | None = None):
-    if ctx.guild is None:
-        await ctx.send("This command must be used in the server.")
-        return
+    assert ctx.guild is not None
 
     # Must be in a voice channel
     author = ctx.author
@@ -1011,38 +1465,47 @@ async def listen(ctx: commands.Context, index: int | None = None):
         await ctx.send("Submissions are not yet in playback format (close submissions first).")
         return
 
-    subs = r["numbered_submissions"]
+    numbered: Dict[str, List[Any]] = r["numbered_submissions"]
+    n = len(numbered["player_id"])
 
     # Determine play order
     if index is not None:
-        if index < 1 or index > len(subs):
+        if index < 1 or index > n:
             await ctx.send("Invalid submission index.")
             return
         target_indices = [index]
     else:
-        target_indices = list(range(1, len(subs) + 1))
+        target_indices = list(range(1, n + 1))
 
     await ctx.send("Preparing audio...")
 
+    # List the audio directory once rather than stat-ing every file
+    have = frozenset(await asyncio.to_thread(os.listdir, AUDIO_DIR))
+
     # Playback loop
     for sid in target_indices:
-        sub = subs[sid - 1]
-        title = sub["title"]
-        url = sub["url"]
-
-
-        filepath = os.path.join(AUDIO_DIR, f"{ctx.guild.id}_{sid}.m4a")
-
-        if not os.path.exists(filepath):
-            # Fallback: download on demand if missing
-            await ctx.send(f"Downloading: **{title}**")
-            filepath = await download_audio(url, f"{ctx.guild.id}_{sid}")
-
-        if not filepath or not os.path.exists(filepath):
+        title = numbered["title"][sid - 1]
+        url = numbered["url"][sid - 1]
+
+        basename = audio_basename(ctx.guild.id, sid, numbered["video_id"][sid - 1])
+        filename = f"{basename}.m4a"
+        filepath: Optional[str] = os.path.join(AUDIO_DIR, filename)
+
+        # Downloads can finish after the listing, so re-check misses on disk
+        if filename not in have and not os.path.exists(filepath):
+            # Wait for the pre-download if it's still running, otherwise
+            # fall back to downloading on demand
+            if (basename, url) not in audio_downloads:
+                await ctx.send(f"Downloading: **{title}**")
+            # Shielded, so cancelling this listen doesn't cancel the shared
+            # download that close_submissions_core may also be waiting on
+            filepath = await asyncio.shield(start_audio_download(url, basename))
+
+        if not filepath:
             await ctx.send(f"Failed to load audio for **{title}**")
             continue
 
-        await playing_status(sub)
+        await playing_status(title, numbered["description"][sid - 1], url)
         await ctx.send(f"Now playing: **{title}**")
         try:
             await play_audio_in_channel(voice_channel, filepath)
@@ -1059,5 +1522,27 @@ async def listen(ctx: commands.Context, index: int | None = None):
 # MAIN
 # ============================================================
 
+async def main():
+    flusher = asyncio.create_task(state_flusher())
+    async with bot:
+        try:
+            await bot.start(TOKEN)
+        finally:
+            flusher.cancel()
+            await asyncio.gather(flusher, return_exceptions=True)
+            # Let an in-flight background write land before the final one,
+            # so it can't replace newer state on disk
+            if _state_write is not None:
+                (result,) = await asyncio.gather(_state_write, return_exceptions=True)
+                if isinstance(result, BaseException):
+                    _state_dirty.set()
+            if _state_dirty.is_set():
+                flush_state()
+            await close_http()
+            _download_pool.shutdown(wait=False, cancel_futures=True)
+
 if __name__ == "__main__":
-    bot.run(TOKEN)
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass